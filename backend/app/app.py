@@ -11,11 +11,13 @@ or printed images using EasyOCR. It allows clients (e.g., a web
 frontend) to upload an image file and receive extracted text in JSON.
 
 Features:
-- Single image upload per request
+- Single image upload per request, or many pages via /extract-text-batch
 - Only allows image file types specified in .env
 - Uses python-dotenv to manage configuration
-- CORS enabled for frontend integration
-- Temporary file storage with automatic cleanup
+- CORS enabled for frontend integration (origin set via CORS_ORIGIN)
+- Uploads are decoded in memory (nothing is written to disk)
+- Concurrent requests are micro-batched for GPU inference
+- Results are cached by file content, so repeated uploads skip OCR
 
 Folder Structure:
 -----------------
@@ -24,46 +26,89 @@ handwriting_ocr_project/
 ├── .venv/                  # Virtual environment
 ├── .env                    # Environment variables
 ├── app.py                  # This Flask backend
+├── gunicorn.conf.py        # Production server settings
 ├── requirements.txt        # Python dependencies
-├── uploads/                # Temporary folder for uploaded images
 └── ocr_utils/              # OCR helper package
     ├── __init__.py
     ├── reader.py
+    ├── batching.py
+    ├── cache.py
     ├── preprocess.py
     └── postprocess.py
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import os
+import orjson
 from dotenv import load_dotenv
-from werkzeug.utils import secure_filename
-from ocr_utils import extract_text_from_image
 
 # ------------------------------
 # Load environment variables from .env
 # ------------------------------
+# Loaded before importing ocr_utils, which reads its batching settings
 load_dotenv()
 
+from ocr_utils import (
+    extract_text_from_image, extract_text_from_images, decode_image,
+    ResultCache, content_key,
+)
+from ocr_utils.reader import batcher
+
+# ------------------------------
+# JSON serialization
+# ------------------------------
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, which serializes considerably
+    faster than the standard library for large OCR outputs. Used by
+    jsonify(), so responses are unchanged for clients.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Write orjson's bytes straight into the response body
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 # ------------------------------
 # Flask app initialization
 # ------------------------------
 app = Flask(__name__)
-CORS(app)  # Enable Cross-Origin requests for frontend apps
+app.json = OrjsonProvider(app)
+
+# Enable Cross-Origin requests for frontend apps, only on the OCR endpoints.
+# max_age lets browsers cache the preflight response instead of repeating it
+CORS(
+    app,
+    resources={r"/extract-text(-batch)?": {"origins": os.getenv("CORS_ORIGIN", "*")}},
+    max_age=int(os.getenv("CORS_MAX_AGE", 86400)),
+)
 
 # ------------------------------
 # App configuration from .env
 # ------------------------------
-# Folder where uploaded images will be temporarily saved
-app.config['UPLOAD_FOLDER'] = os.getenv("UPLOAD_FOLDER", "app/uploads")
-
-# Allowed file extensions (e.g., jpg, png)
-app.config['ALLOWED_EXTENSIONS'] = set(
-    os.getenv("ALLOWED_EXTENSIONS", "jpg,jpeg,png").split(',')
+# Allowed file extensions (e.g., jpg, png), parsed once at startup
+ALLOWED_EXTENSIONS = frozenset(
+    ext.strip().lower() for ext in os.getenv("ALLOWED_EXTENSIONS", "jpg,jpeg,png").split(',')
 )
+app.config['ALLOWED_EXTENSIONS'] = ALLOWED_EXTENSIONS
+
+# Largest accepted request body in bytes; bigger uploads get a JSON 413
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_CONTENT_LENGTH", 64 * 1024 * 1024))
 
-# Ensure the upload folder exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Maximum number of images accepted by /extract-text-batch in one request
+MAX_BATCH_FILES = int(os.getenv("OCR_MAX_FILES", 32))
+
+# Number of OCR results kept in memory, keyed by file contents (0 disables)
+result_cache = ResultCache(int(os.getenv("OCR_CACHE_SIZE", 4096)))
 
 # ------------------------------
 # Utility functions
@@ -82,7 +127,23 @@ def allowed_file(filename):
     bool
         True if the file extension is allowed, False otherwise.
     """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot + 1:].lower() in ALLOWED_EXTENSIONS
+
+# ------------------------------
+# Error handlers
+# ------------------------------
+@app.errorhandler(HTTPException)
+def handle_http_error(error):
+    """
+    Return HTTP errors (404, 405, 413, ...) as JSON instead of HTML.
+
+    Returns:
+    --------
+    JSON
+        An 'error' message with the matching status code.
+    """
+    return jsonify({'error': error.description}), error.code
 
 # ------------------------------
 # API routes
@@ -99,6 +160,25 @@ def home():
     """
     return jsonify({"message": "AI Handwriting OCR API Running..."})
 
+@app.route('/batch-stats')
+def batch_stats():
+    """
+    Report how the batching queue has grouped images, for tuning the
+    shape buckets (see _bucket_key in ocr_utils/reader.py).
+
+    Returns:
+    --------
+    JSON
+        A dictionary containing:
+        - 'buckets': List of {'aspect', 'area', 'images', 'batches'},
+          where images / batches is the average batch size.
+    """
+    buckets = [
+        {'aspect': aspect, 'area': area, **counts}
+        for (aspect, area), counts in batcher.bucket_stats().items()
+    ]
+    return jsonify({'buckets': buckets})
+
 @app.route('/extract-text', methods=['POST'])
 def extract_text():
     """
@@ -108,9 +188,9 @@ def extract_text():
     --------
     1. Verify 'file' is in the request.
     2. Check file name and allowed extension.
-    3. Save file temporarily in UPLOAD_FOLDER.
-    4. Pass file to OCR utility to extract text.
-    5. Remove the temporary file.
+    3. Return the cached text if this exact file was seen before.
+    4. Decode the uploaded bytes in memory.
+    5. Pass the image to OCR utility to extract text.
     6. Return extracted text as JSON.
 
     Returns:
@@ -131,24 +211,100 @@ def extract_text():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Unsupported file type'}), 400
 
-    # Secure the filename and save temporarily
-    filename = secure_filename(file.filename)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(file_path)
+    data = file.read()
 
-    # Extract text using OCR
-    extracted_text = extract_text_from_image(file_path)
+    # Identical uploads skip OCR entirely
+    key = content_key(data)
+    extracted_text = result_cache.get(key)
+    if extracted_text is not None:
+        return jsonify({'extracted_text': extracted_text})
+
+    # Decode the upload straight from the request stream
+    try:
+        img = decode_image(data)
+    except ValueError:
+        return jsonify({'error': 'Invalid image file'}), 400
 
-    # Remove the uploaded file after processing (optional cleanup)
-    os.remove(file_path)
+    # Extract text using OCR
+    extracted_text = extract_text_from_image(img)
+    result_cache.put(key, extracted_text)
 
     # Return the extracted text as JSON
     return jsonify({'extracted_text': extracted_text})
 
+@app.route('/extract-text-batch', methods=['POST'])
+def extract_text_batch():
+    """
+    Endpoint to extract text from several uploaded images in one request
+    (e.g. the pages of a document).
+
+    Process:
+    --------
+    1. Verify 'files' is in the request and within OCR_MAX_FILES.
+    2. Check every file name and allowed extension.
+    3. Look up each file in the cache by its contents.
+    4. Decode the remaining files in memory.
+    5. Run OCR on all of them together so they are batched.
+    6. Return the extracted texts as JSON, in upload order.
+
+    Returns:
+    --------
+    JSON
+        A dictionary containing:
+        - 'results': List of extracted texts, one per uploaded image.
+        Or an 'error' message if something went wrong.
+    """
+    files = request.files.getlist('files')
+    if not files:
+        return jsonify({'error': 'No files part in request'}), 400
+
+    if len(files) > MAX_BATCH_FILES:
+        return jsonify({'error': f'Too many files (maximum {MAX_BATCH_FILES})'}), 400
+
+    for file in files:
+        if file.filename == '':
+            return jsonify({'error': 'No selected file'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'error': f'Unsupported file type: {file.filename}'}), 400
+
+    results = [None] * len(files)
+    pending = []  # (index, cache key, decoded image) of uncached files
+
+    for i, file in enumerate(files):
+        data = file.read()
+
+        # Identical uploads skip OCR entirely
+        key = content_key(data)
+        results[i] = result_cache.get(key)
+        if results[i] is not None:
+            continue
+
+        try:
+            pending.append((i, key, decode_image(data)))
+        except ValueError:
+            return jsonify({'error': f'Invalid image file: {file.filename}'}), 400
+
+    # Extract text for all uncached images in one batched call
+    if pending:
+        texts = extract_text_from_images([img for _, _, img in pending])
+        for (i, key, _), text in zip(pending, texts):
+            results[i] = text
+            result_cache.put(key, text)
+
+    return jsonify({'results': results})
+
 # ------------------------------
 # Run the Flask app
 # ------------------------------
+# Development server only; in production serve with gunicorn:
+#   gunicorn -c gunicorn.conf.py app:app
 if __name__ == '__main__':
+    if not os.getenv("FLASK_DEV"):
+        raise SystemExit(
+            "Set FLASK_DEV=1 to use the development server, "
+            "or run: gunicorn -c gunicorn.conf.py app:app"
+        )
+
     port = int(os.getenv("PORT", 8000))
     # host='0.0.0.0' makes it accessible from network
     app.run(host='0.0.0.0', port=port, debug=False)
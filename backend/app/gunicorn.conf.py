@@ -0,0 +1,37 @@
+"""
+Gunicorn Configuration for the OCR API
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Production server settings. Run from the backend/app folder with:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+A single worker keeps one EasyOCR model (and one CUDA context) in
+memory, while many threads feed its shared micro-batching queue.
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Read PORT and the GUNICORN_* settings from .env, like app.py does
+load_dotenv()
+
+# Listen on all interfaces, same port as the dev server
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+
+# One process owns the GPU; concurrency comes from threads
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+
+# Load the app (EasyOCR weights + warm-up) once in the master and fork the
+# workers from it, sharing model memory copy-on-write. CPU only: a CUDA
+# context cannot be used after fork, so leave this off when running on GPU
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+# Model loading and warm-up can take a while on first start
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
@@ -7,15 +7,22 @@ Date: 26-Oct-2025
 Description:
 -------------
 This package contains all utilities for OCR processing, including:
-- Image preprocessing
+- Image loading and (optional) preprocessing
 - Text extraction using EasyOCR
 - Text post-processing
+- Caching of results by file content
 """
 
-from ocr_utils.reader import extract_text_from_image
-from ocr_utils.preprocess import preprocess_image
+from ocr_utils.reader import extract_text_from_image, extract_text_from_images
+from ocr_utils.preprocess import load_image, decode_image, downscale_image, preprocess_image
 from ocr_utils.postprocess import clean_text
+from ocr_utils.cache import ResultCache, content_key
 
 
 # Define what is accessible when importing ocr_utils directly
-__all__ = ["extract_text_from_image", "preprocess_image", "clean_text"]
+__all__ = [
+    "extract_text_from_image", "extract_text_from_images",
+    "load_image", "decode_image", "downscale_image", "preprocess_image",
+    "clean_text",
+    "ResultCache", "content_key",
+]
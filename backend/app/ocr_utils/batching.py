@@ -0,0 +1,234 @@
+"""
+Micro-batching Queue for OCR Inference
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Collects images submitted by concurrent requests for a short window and
+runs them through the OCR model as a single batch. Each caller blocks
+until the result for its own image is ready.
+
+Images are grouped into buckets of similar shape (see `key`), and only
+images from the same bucket are batched together, so little compute is
+wasted on stretching or padding mismatched images to a common size.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import Counter
+
+
+class _Slot:
+    """
+    Holds the image of a single request and, once the batch has run,
+    its result (or the exception raised while processing it).
+    """
+
+    __slots__ = ("image", "event", "result", "error")
+
+    def __init__(self, image):
+        self.image = image
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Background workers that group incoming images into batches.
+
+    Parameters:
+    -----------
+    infer : callable
+        Function taking a list of images and returning a list of results
+        in the same order.
+    max_batch : int
+        Maximum number of images dispatched in a single batch.
+    window_ms : float
+        Longest time an image waits for its bucket to fill before the
+        bucket is dispatched anyway.
+    workers : int
+        Number of worker threads. With more than one, the next batch can
+        be collected and uploaded while the previous one is still running.
+    key : callable, optional
+        Maps an image to its bucket key. By default all images share a
+        single bucket.
+
+    Worker threads are started on the first submit in each process, so a
+    batcher created before a fork (e.g. gunicorn --preload) still works
+    in the forked workers.
+    """
+
+    def __init__(self, infer, max_batch: int = 8, window_ms: float = 30,
+                 workers: int = 1, key=None):
+        self.infer = infer
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self.key = key or (lambda image: None)
+
+        self.workers = workers
+
+        # Images and batches dispatched per bucket key, for tuning the
+        # bucketing (written by the collector, read by bucket_stats)
+        self.bucket_images = Counter()
+        self.bucket_batches = Counter()
+        self._stats_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_started(self):
+        """
+        Start the collector and worker threads if this process has none.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            self._queue = queue.Queue()
+            self._ready = queue.Queue()
+            threads = [
+                threading.Thread(target=self._collect, name="ocr-batcher-collect", daemon=True)
+            ] + [
+                threading.Thread(target=self._run, name=f"ocr-batcher-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, image):
+        """
+        Queue an image and block until its result is available.
+
+        Parameters:
+        -----------
+        image : np.ndarray
+            Image to run through the OCR model
+
+        Returns:
+        --------
+        object
+            The result produced by `infer` for this image
+        """
+        return self.submit_many([image])[0]
+
+    def submit_many(self, images: list) -> list:
+        """
+        Queue several images at once and block until all results are
+        available. The images arrive together, so similar ones share a
+        batch.
+
+        Parameters:
+        -----------
+        images : list of np.ndarray
+            Images to run through the OCR model
+
+        Returns:
+        --------
+        list
+            The results produced by `infer`, in the same order as `images`
+        """
+        self._ensure_started()
+
+        slots = [_Slot(image) for image in images]
+        for slot in slots:
+            self._queue.put(slot)
+
+        for slot in slots:
+            slot.event.wait()
+            if slot.error is not None:
+                raise slot.error
+
+        return [slot.result for slot in slots]
+
+    def bucket_stats(self) -> dict:
+        """
+        Return dispatch counts per bucket key.
+
+        Returns:
+        --------
+        dict
+            Maps each bucket key to {'images': int, 'batches': int}. A
+            low images/batches ratio means the bucket rarely fills up.
+        """
+        with self._stats_lock:
+            return {
+                key: {'images': images, 'batches': self.bucket_batches[key]}
+                for key, images in self.bucket_images.items()
+            }
+
+    def _collect(self):
+        """
+        Collector loop: sort incoming images into buckets and hand a
+        bucket to the workers once it is full or its oldest image has
+        waited for the whole batching window.
+        """
+        pending = {}
+        deadlines = {}
+
+        while True:
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+
+            try:
+                slot = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                slot = None
+
+            if slot is not None:
+                try:
+                    key = self.key(slot.image)
+                except Exception as exc:
+                    # Fail this image only; the collector must keep running
+                    slot.error = exc
+                    slot.event.set()
+                else:
+                    bucket = pending.setdefault(key, [])
+                    if not bucket:
+                        deadlines[key] = time.monotonic() + self.window
+                    bucket.append(slot)
+
+                    if len(bucket) >= self.max_batch:
+                        self._dispatch(key, pending, deadlines)
+
+            now = time.monotonic()
+            for key in [k for k, deadline in deadlines.items() if deadline <= now]:
+                self._dispatch(key, pending, deadlines)
+
+    def _dispatch(self, key, pending: dict, deadlines: dict):
+        """
+        Move a bucket from the pending set to the worker queue.
+        """
+        batch = pending.pop(key)
+        del deadlines[key]
+        with self._stats_lock:
+            self.bucket_images[key] += len(batch)
+            self.bucket_batches[key] += 1
+        self._ready.put(batch)
+
+    def _run(self):
+        """
+        Worker loop: take a ready batch, run inference and wake up every
+        caller waiting on it.
+        """
+        while True:
+            batch = self._ready.get()
+            try:
+                results = self.infer([slot.image for slot in batch])
+                for slot, result in zip(batch, results):
+                    slot.result = result
+            except Exception as exc:
+                for slot in batch:
+                    slot.error = exc
+            finally:
+                for slot in batch:
+                    slot.event.set()
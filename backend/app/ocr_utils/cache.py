@@ -0,0 +1,71 @@
+"""
+OCR Result Cache
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Content-addressed, in-memory LRU cache for extracted text. Identical
+uploads (retries, repeated tests) are answered without running OCR.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_key(data: bytes) -> str:
+    """
+    Compute the cache key for an uploaded file.
+
+    Parameters:
+    -----------
+    data : bytes
+        Raw file contents
+
+    Returns:
+    --------
+    str
+        Hex digest identifying the file contents
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe least-recently-used cache mapping content keys to text.
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of entries kept; 0 disables caching
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """
+        Return the cached text for `key`, or None if it is not cached.
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str):
+        """
+        Store `value` under `key`, evicting the oldest entry when full.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
@@ -0,0 +1,197 @@
+"""
+ONNX Runtime Backend for the Text Detector
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Exports EasyOCR's CRAFT text detector to ONNX once and runs it with
+ONNX Runtime (TensorRT or CUDA execution provider when available).
+The detector is the heaviest part of the pipeline and benefits most
+from fused kernels. onnxruntime is optional; without it the regular
+PyTorch detector is used.
+"""
+
+import os
+import tempfile
+import warnings
+import numpy as np
+import torch
+
+# Execution providers in order of preference
+_PROVIDERS = (
+    "TensorrtExecutionProvider",
+    "CUDAExecutionProvider",
+    "CPUExecutionProvider",
+)
+
+
+class OnnxDetector:
+    """
+    Drop-in replacement for EasyOCR's detector module.
+
+    EasyOCR calls the detector as `y, feature = net(x)` with a float32
+    NCHW tensor; this class keeps that interface but runs the exported
+    graph through an ONNX Runtime session.
+
+    Parameters:
+    -----------
+    session : onnxruntime.InferenceSession
+        Session created from the exported CRAFT model
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+        # GPU tensors can only be bound in place when ORT actually runs
+        # on CUDA; a CPU-only session (CPU package, or a CUDA provider that
+        # failed to load) needs the input copied to host memory
+        self.cuda_input = "CUDAExecutionProvider" in session.get_providers()
+
+    def __call__(self, x: torch.Tensor):
+        if x.is_cuda and not self.cuda_input:
+            x = x.cpu()
+        x = x.contiguous()
+
+        # ONNX Runtime reads the tensor on its own stream; make sure the
+        # upload issued on the caller's stream has finished first
+        if x.is_cuda:
+            torch.cuda.current_stream(x.device).synchronize()
+
+        # Bind the tensor where it already lives (GPU or CPU) to avoid a copy
+        binding = self.session.io_binding()
+        binding.bind_input(
+            "input", x.device.type, x.device.index or 0,
+            np.float32, tuple(x.shape), x.data_ptr()
+        )
+        binding.bind_output("y")
+        binding.bind_output("feature")
+        self.session.run_with_iobinding(binding)
+
+        y, feature = binding.copy_outputs_to_cpu()
+        return torch.from_numpy(y), torch.from_numpy(feature)
+
+
+def export_detector(reader, model_path: str):
+    """
+    Export the CRAFT detector of an EasyOCR reader to ONNX.
+
+    Parameters:
+    -----------
+    reader : easyocr.Reader
+        Reader whose detector should be exported
+    model_path : str
+        Destination .onnx file
+
+    The graph is written to a temporary file and moved into place, so a
+    crashed or concurrent export (several workers starting at once)
+    never leaves a truncated model at `model_path`.
+    """
+    # EasyOCR wraps the GPU detector in DataParallel
+    net = getattr(reader.detector, "module", reader.detector)
+    dummy = torch.zeros((1, 3, 640, 640), device=reader.device)
+
+    fd, tmp_path = tempfile.mkstemp(
+        suffix=".onnx", dir=os.path.dirname(os.path.abspath(model_path))
+    )
+    os.close(fd)
+
+    try:
+        # dynamo=False: the TorchScript exporter honours opset_version and
+        # dynamic_axes and only needs the onnx package (not onnxscript)
+        with torch.no_grad():
+            torch.onnx.export(
+                net,
+                dummy,
+                tmp_path,
+                dynamo=False,
+                opset_version=17,
+                input_names=["input"],
+                output_names=["y", "feature"],
+                dynamic_axes={
+                    "input": {0: "B", 2: "H", 3: "W"},
+                    "y": {0: "B", 1: "h", 2: "w"},
+                    "feature": {0: "B", 2: "h", 3: "w"},
+                },
+            )
+        os.replace(tmp_path, model_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def use_onnx_detector(reader, model_path: str, fp16: bool = False,
+                      max_batch: int = 8, max_side: int = 1600,
+                      opt_shape: tuple = (1216, 1600)) -> bool:
+    """
+    Replace the reader's detector with an ONNX Runtime session.
+
+    The model is exported on first use and reused on later starts. If
+    onnxruntime is missing or the export fails, a warning is issued and
+    the PyTorch detector is kept.
+
+    Parameters:
+    -----------
+    reader : easyocr.Reader
+        Reader whose detector should be replaced
+    model_path : str
+        Location of the exported .onnx file
+    fp16 : bool
+        Let TensorRT build FP16 engines
+    max_batch : int
+        Largest batch the detector will see
+    max_side : int
+        Largest input height or width the detector will see
+    opt_shape : tuple
+        (height, width) TensorRT should optimize its engine for
+
+    Returns:
+    --------
+    bool
+        True if the ONNX detector is in use, False if the PyTorch
+        detector was kept
+    """
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        warnings.warn("onnxruntime is not installed; using the PyTorch detector")
+        return False
+
+    if not os.path.exists(model_path):
+        try:
+            export_detector(reader, model_path)
+        except Exception as exc:
+            warnings.warn(f"ONNX export of the detector failed ({exc}); using the PyTorch detector")
+            return False
+
+    # TensorRT engines are expensive to build; cache them next to the model.
+    # The explicit profile covers every shape the batcher can produce, so
+    # engines are built once instead of again whenever a batch falls
+    # outside the shapes seen so far
+    opt_h, opt_w = opt_shape
+    trt_options = {
+        "trt_fp16_enable": fp16,
+        "trt_engine_cache_enable": True,
+        "trt_engine_cache_path": os.path.dirname(os.path.abspath(model_path)),
+        "trt_profile_min_shapes": "input:1x3x32x32",
+        "trt_profile_opt_shapes": f"input:{max_batch}x3x{opt_h}x{opt_w}",
+        "trt_profile_max_shapes": f"input:{max_batch}x3x{max_side}x{max_side}",
+    }
+    available = ort.get_available_providers()
+    providers = [
+        (name, trt_options) if name == "TensorrtExecutionProvider" else name
+        for name in _PROVIDERS if name in available
+    ]
+
+    session = ort.InferenceSession(model_path, providers=providers)
+
+    # ORT silently falls back to the CPU if a GPU provider fails to load
+    if reader.device != "cpu" and "CUDAExecutionProvider" not in session.get_providers():
+        warnings.warn(
+            "ONNX Runtime has no CUDA provider available; "
+            "the ONNX detector will run on the CPU"
+        )
+
+    reader.detector = OnnxDetector(session)
+    return True
@@ -12,13 +12,19 @@ Removes unwanted characters, corrects spacing, and fixes minor OCR errors.
 
 import re
 
+# Any run of whitespace or non-printable characters (everything outside
+# printable ASCII 0x21-0x7E). Replacing each run with a single space
+# removes junk characters and collapses spacing in one pass.
+_SEPARATORS = re.compile(r'[^\x21-\x7E]+')
+
 def clean_text(text: str) -> str:
     """
     Clean OCR extracted text.
 
     Steps:
-    1. Remove extra spaces and newlines
-    2. Remove non-printable characters
+    1. Replace non-printable characters, newlines and runs of spaces
+       with a single space
+    2. Strip leading/trailing whitespace
     3. Optional: fix common OCR mistakes (e.g., '0' -> 'O', '1' -> 'I')
 
     Parameters:
@@ -31,11 +37,12 @@ def clean_text(text: str) -> str:
     str
         Cleaned and readable text
     """
-    # Remove non-printable characters
-    text = re.sub(r'[^\x20-\x7E]', '', text)
+    # Fast path: printable ASCII with single spaces needs no substitution
+    if text.isascii() and text.isprintable() and '  ' not in text:
+        return text.strip()
 
-    # Remove multiple spaces
-    text = re.sub(r'\s+', ' ', text)
+    # Replace non-printable characters and collapse spaces in one pass
+    text = _SEPARATORS.sub(' ', text)
 
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -6,22 +6,75 @@ Author: Shuvomoy Sarkar
 Date: 26-Oct-2025
 Description:
 -------------
-Contains functions to preprocess images before feeding them to OCR.
-Preprocessing improves OCR accuracy by enhancing image quality.
+Contains functions to load and preprocess images before feeding them
+to OCR. EasyOCR works best on the original color image, so thresholding
+is opt-in (see OCR_PREPROCESS in reader.py).
 """
 
+import os
+import threading
 import cv2
 import numpy as np
 
-def preprocess_image(image_path: str) -> np.ndarray:
+# Images larger than this (longest side, in pixels) are downscaled as soon
+# as they are loaded. CRAFT resizes internally anyway, so full-resolution
+# phone photos only cost memory bandwidth and host-to-device transfer.
+# 0 disables downscaling
+MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", 1600))
+
+# 1D 5-tap Gaussian kernel (sigma derived from size, as GaussianBlur(.., 0)
+# does). Applied as a row pass then a column pass: 10 instead of 25
+# multiply-adds per pixel, and both passes use OpenCV's SIMD row filters
+# Matches GaussianBlur to within rounding: GaussianBlur uses fixed-point
+# arithmetic for 8-bit images, so about 0.2% of pixels differ by 1 level
+_GAUSS_KERNEL = cv2.getGaussianKernel(5, 0)
+
+# Per-thread scratch buffer reused across calls for the blurred image
+_scratch = threading.local()
+
+def _scratch_buffer(height: int, width: int) -> np.ndarray:
     """
-    Load and preprocess an image for OCR.
+    Return a C-contiguous (height, width) uint8 view into this thread's
+    scratch buffer, growing the buffer only when a larger image arrives.
+    """
+    size = height * width
+    buf = getattr(_scratch, "buf", None)
+    if buf is None or buf.size < size:
+        buf = np.empty(size, np.uint8)
+        _scratch.buf = buf
 
-    Steps:
-    1. Read image in grayscale
-    2. Apply thresholding / adaptive thresholding
-    3. Optional: noise reduction (Gaussian blur)
-    4. Return preprocessed image
+    return buf[:size].reshape(height, width)
+
+def downscale_image(img: np.ndarray, max_side: int = MAX_SIDE) -> np.ndarray:
+    """
+    Shrink an image so its longest side is at most `max_side` pixels,
+    preserving the aspect ratio. Smaller images are returned unchanged.
+
+    Parameters:
+    -----------
+    img : np.ndarray
+        Grayscale or color image
+    max_side : int
+        Maximum length of the longest side; 0 disables downscaling
+
+    Returns:
+    --------
+    np.ndarray
+        The (possibly) downscaled image
+    """
+    h, w = img.shape[:2]
+    if max_side <= 0 or max(h, w) <= max_side:
+        return img
+
+    # INTER_AREA avoids aliasing when shrinking. Keep at least one pixel
+    # on the short side for extreme aspect ratios (e.g. a 1x5000 strip)
+    scale = max_side / max(h, w)
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+def load_image(image_path: str) -> np.ndarray:
+    """
+    Load an image for OCR without any further processing.
 
     Parameters:
     -----------
@@ -31,24 +84,86 @@ def preprocess_image(image_path: str) -> np.ndarray:
     Returns:
     --------
     np.ndarray
-        Preprocessed image ready for OCR
+        Color (BGR) image, downscaled to at most MAX_SIDE pixels
     """
-    # Read image in grayscale
-    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    img = cv2.imread(image_path, cv2.IMREAD_COLOR)
     if img is None:
         raise FileNotFoundError(f"Image not found: {image_path}")
 
-    # Apply Gaussian blur to reduce noise
-    img_blur = cv2.GaussianBlur(img, (5, 5), 0)
+    return downscale_image(img)
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    Decode an uploaded image straight from memory, without touching disk.
+
+    Parameters:
+    -----------
+    data : bytes
+        Encoded image file contents (e.g. JPEG or PNG)
+
+    Returns:
+    --------
+    np.ndarray
+        Color (BGR) image, downscaled to at most MAX_SIDE pixels
+    """
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Could not decode image data")
+
+    return downscale_image(img)
+
+def preprocess_image(image) -> np.ndarray:
+    """
+    Load and preprocess an image for OCR.
+
+    Steps:
+    1. Read image in grayscale (or convert an already decoded image)
+    2. Downscale if the longest side exceeds MAX_SIDE
+    3. Noise reduction (Gaussian blur) into a reused scratch buffer
+    4. Adaptive thresholding written back into the image buffer
+
+    Parameters:
+    -----------
+    image : str or np.ndarray
+        Path to the input image file, or an already decoded image
+
+    Returns:
+    --------
+    np.ndarray
+        Preprocessed image ready for OCR
+    """
+    if isinstance(image, np.ndarray):
+        # Work on our own grayscale copy; the caller's array is left untouched
+        img = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image.copy()
+    else:
+        # Read image in grayscale
+        img = cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            raise FileNotFoundError(f"Image not found: {image}")
+
+    # Downscale large images (no-op if already done when loading)
+    img = downscale_image(img)
+    h, w = img.shape
+
+    # SIMD filter paths need a C-contiguous image
+    img = np.ascontiguousarray(img)
+
+    # Apply separable Gaussian blur to reduce noise
+    img_blur = _scratch_buffer(h, w)
+    cv2.sepFilter2D(
+        img, -1, _GAUSS_KERNEL, _GAUSS_KERNEL,
+        dst=img_blur, borderType=cv2.BORDER_REFLECT_101
+    )
 
-    # Apply adaptive thresholding to enhance contrast
-    img_thresh = cv2.adaptiveThreshold(
+    # Apply adaptive thresholding to enhance contrast (in place)
+    cv2.adaptiveThreshold(
         img_blur,
         255,
         cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY,
         11,
-        2
+        2,
+        dst=img
     )
 
-    return img_thresh
+    return img
@@ -8,45 +8,275 @@ Description:
 -------------
 Contains function to extract text from an image using EasyOCR.
 Supports handwriting and printed text recognition.
+Concurrent requests are grouped into batches before inference.
 """
 
+import os
+import contextlib
+import threading
+import cv2
 import easyocr
-from ocr_utils.preprocess import preprocess_image
+import numpy as np
+import torch
+from ocr_utils.batching import MicroBatcher
+from ocr_utils.onnx_backend import OnnxDetector, use_onnx_detector
+from ocr_utils.preprocess import MAX_SIDE, load_image, preprocess_image
 from ocr_utils.postprocess import clean_text
 
+# Apply grayscale + blur + adaptive threshold before OCR. Disabled by
+# default: EasyOCR expects natural images and usually does better without it
+PREPROCESS = os.getenv("OCR_PREPROCESS", "false").lower() in ("1", "true", "yes")
+
+# Inference precision:
+#   auto - default: fp32 on GPU, int8 when no CUDA device is present
+#          (EasyOCR's own default on CPU)
+#   fp32 - full precision, also on CPU-only hosts
+#   fp16 - mixed precision on GPU (autocast), roughly halves activation memory
+#   int8 - CPU inference with dynamically quantized weights
+PRECISION = os.getenv("OCR_PRECISION", "auto").lower()
+if PRECISION not in ("auto", "fp32", "fp16", "int8"):
+    raise ValueError(f"Unsupported OCR_PRECISION: {PRECISION}")
+if PRECISION == "auto":
+    PRECISION = "fp32" if torch.cuda.is_available() else "int8"
+
+# Detector backend: torch (EasyOCR default) or onnx (ONNX Runtime with
+# TensorRT/CUDA; requires the optional onnxruntime package)
+BACKEND = os.getenv("OCR_BACKEND", "torch").lower()
+if BACKEND not in ("torch", "onnx"):
+    raise ValueError(f"Unsupported OCR_BACKEND: {BACKEND}")
+
+# ------------------------------
+# Batching configuration
+# ------------------------------
+# Maximum number of images sent to EasyOCR in one call
+MAX_BATCH = int(os.getenv("OCR_MAX_BATCH", 8))
+
+# Longest time (ms) an image waits for similar images before its batch runs
+BATCH_WINDOW_MS = float(os.getenv("OCR_BATCH_WINDOW_MS", 30))
+
+# Number of batching workers. On GPU each worker issues work on its own
+# CUDA stream, so one batch's host-to-device copies overlap another's compute
+BATCH_WORKERS = int(os.getenv("OCR_BATCH_WORKERS", 2 if torch.cuda.is_available() else 1))
+
+# Batched images are resized to a common shape rounded up to this multiple
+# (the CRAFT detector's stride)
+SHAPE_MULTIPLE = 32
+
+# Shapes (height, width) of the pages used to warm up the model: 4:3
+# phone photos, landscape and portrait, after downscaling to OCR_MAX_SIDE.
+# These are the shapes most uploads end up with, so their cuDNN plans are
+# tuned before serving
+_WARMUP_SIDE = MAX_SIDE if MAX_SIDE > 0 else 1600
+WARMUP_SHAPES = [
+    (_WARMUP_SIDE * 3 // 4, _WARMUP_SIDE),
+    (_WARMUP_SIDE, _WARMUP_SIDE * 3 // 4),
+]
+
+# Let cuDNN pick and cache the fastest convolution algorithm per input
+# shape. Plans are keyed by (batch size, height, width); rounding to
+# SHAPE_MULTIPLE makes repeats of a shape hit the cache, but the first
+# batch at any shape not covered by the warm-up pays for autotuning
+torch.backends.cudnn.benchmark = True
+
 # Initialize EasyOCR reader globally to avoid reloading every request
 # English language; you can add more languages like ['en','hi'] if needed
-reader = easyocr.Reader(['en'], gpu=True)  # Set gpu=True if you have CUDA
+# int8 runs on the CPU; EasyOCR only applies quantize=True to CPU models
+reader = easyocr.Reader(
+    ['en'], gpu=PRECISION != "int8", cudnn_benchmark=True,
+    quantize=PRECISION == "int8"
+)
+
+def _round_up(size: int) -> int:
+    """
+    Round a height or width up to the next multiple of SHAPE_MULTIPLE.
+    """
+    return -(-size // SHAPE_MULTIPLE) * SHAPE_MULTIPLE
+
+
+# Swap in the ONNX detector, exported once into EasyOCR's model folder.
+# The detector sees each batch padded to SHAPE_MULTIPLE; EasyOCR caps the
+# longest side at 2560 (its canvas_size) when downscaling is disabled
+if BACKEND == "onnx":
+    onnx_path = os.getenv(
+        "OCR_ONNX_PATH", os.path.join(reader.model_storage_directory, "craft.onnx")
+    )
+    use_onnx_detector(
+        reader, onnx_path, fp16=PRECISION == "fp16",
+        max_batch=MAX_BATCH,
+        max_side=min(_round_up(MAX_SIDE), 2560) if MAX_SIDE > 0 else 2560,
+        opt_shape=tuple(_round_up(side) for side in WARMUP_SHAPES[0]),
+    )
+
+
+class _Float32Detector:
+    """
+    Wraps the PyTorch detector for fp16 inference. Under autocast CRAFT
+    returns float16 score maps, which EasyOCR hands to OpenCV functions
+    (cv2.threshold) that only accept float32.
+    """
 
-def extract_text_from_image(image_path: str) -> str:
+    def __init__(self, net):
+        self.net = net
+
+    def __call__(self, x):
+        y, feature = self.net(x)
+        return y.float(), feature.float()
+
+
+if PRECISION == "fp16" and not isinstance(reader.detector, OnnxDetector):
+    reader.detector = _Float32Detector(reader.detector)
+
+
+def _precision_context():
+    """
+    Return the context manager inference should run under for PRECISION.
+    """
+    if PRECISION == "fp16" and reader.device != "cpu":
+        return torch.autocast("cuda", dtype=torch.float16)
+    return contextlib.nullcontext()
+
+
+# Per-thread CUDA stream used by each batching worker
+_streams = threading.local()
+
+def _stream_context():
+    """
+    Return a context manager running the calling thread's work on its own
+    CUDA stream (created on first use), or a no-op context on CPU.
     """
-    Extract text from an image file using EasyOCR.
+    if reader.device == "cpu":
+        return contextlib.nullcontext()
+
+    stream = getattr(_streams, "stream", None)
+    if stream is None:
+        stream = _streams.stream = torch.cuda.Stream()
+    return torch.cuda.stream(stream)
+
+
+def _bucket_key(image: np.ndarray) -> tuple:
+    """
+    Group images by aspect ratio and area so each batch needs little
+    resizing to reach its common shape.
+    """
+    h, w = image.shape[:2]
+    return round(w / h, 1), round(h * w, -4)
+
+
+def _read_batch(images: list) -> list:
+    """
+    Run EasyOCR on a batch of images in a single call.
+
+    Every image is resized to the largest height and width in the batch,
+    rounded up to SHAPE_MULTIPLE.
+
+    Parameters:
+    -----------
+    images : list of np.ndarray
+        Images collected by the batching worker
+
+    Returns:
+    --------
+    list
+        One list of recognized text fragments per input image
+    """
+    height = _round_up(max(img.shape[0] for img in images))
+    width = _round_up(max(img.shape[1] for img in images))
+
+    with _stream_context(), _precision_context():
+        # detail=0: return only the strings, not boxes and confidences
+        return reader.readtext_batched(
+            images, n_width=width, n_height=height, detail=0
+        )
+
+
+def _warmup_image(height: int, width: int) -> np.ndarray:
+    """
+    Build a synthetic page with a few lines of dark text on white. A blank
+    image yields no detections, so the recognizer would never run.
+    """
+    img = np.full((height, width, 3), 255, np.uint8)
+    for i, y in enumerate(range(80, height - 40, 120)):
+        cv2.putText(
+            img, f"TextWeave warm-up line {i + 1}", (40, y),
+            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3, cv2.LINE_AA
+        )
+    return img
+
+
+# Warm up both networks so the first request does not pay the setup cost.
+# Both a lone request and a full batch are common, and cuDNN tunes each
+# batch size separately
+for shape in WARMUP_SHAPES:
+    for batch_size in sorted({1, MAX_BATCH}):
+        _read_batch([_warmup_image(*shape)] * batch_size)
+
+batcher = MicroBatcher(
+    _read_batch, max_batch=MAX_BATCH, window_ms=BATCH_WINDOW_MS,
+    workers=BATCH_WORKERS, key=_bucket_key
+)
+
+
+def _prepare_image(image) -> np.ndarray:
+    """
+    Load the image, preprocessing it only when OCR_PREPROCESS is set.
+    """
+    if PREPROCESS:
+        return preprocess_image(image)
+    if isinstance(image, np.ndarray):
+        return image
+    return load_image(image)
+
+
+def extract_text_from_image(image) -> str:
+    """
+    Extract text from an image using EasyOCR.
 
     Steps:
-    1. Preprocess the image to enhance OCR accuracy
-    2. Use EasyOCR to read text
+    1. Load the image (thresholded only if OCR_PREPROCESS is set)
+    2. Queue the image for batched EasyOCR inference
     3. Post-process the text to clean it
 
     Parameters:
     -----------
-    image_path : str
-        Path to the input image file
+    image : str or np.ndarray
+        Path to the input image file, or an already decoded image
 
     Returns:
     --------
     str
         Cleaned extracted text from the image
     """
-    # Preprocess the image
-    preprocessed_img = preprocess_image(image_path)
+    # Load the image
+    img = _prepare_image(image)
 
-    # Perform OCR
-    result = reader.readtext(preprocessed_img)
+    # Perform OCR (batched with other concurrent requests)
+    result = batcher.submit(img)
 
     # Concatenate detected text
-    raw_text = " ".join([text[1] for text in result])
+    raw_text = " ".join(result)
 
     # Post-process text (cleanup)
     cleaned_text = clean_text(raw_text)
 
     return cleaned_text
+
+
+def extract_text_from_images(images: list) -> list:
+    """
+    Extract text from several images, e.g. the pages of one document.
+
+    All images are queued together, so they are batched with each other
+    (and with concurrent requests) instead of one model call per image.
+
+    Parameters:
+    -----------
+    images : list of str or np.ndarray
+        Paths to image files, or already decoded images
+
+    Returns:
+    --------
+    list of str
+        Cleaned extracted text for each image, in input order
+    """
+    results = batcher.submit_many([_prepare_image(image) for image in images])
+    return [clean_text(" ".join(result)) for result in results]
@@ -0,0 +1,131 @@
+"""
+Tests for the micro-batching queue
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Exercises MicroBatcher with a stub `infer`, so no OCR model is needed.
+Run from the backend/app folder with: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import pathlib
+import threading
+
+import pytest
+
+# Load batching.py directly: importing the ocr_utils package would load
+# the EasyOCR model
+_spec = importlib.util.spec_from_file_location(
+    "batching", pathlib.Path(__file__).parents[1] / "ocr_utils" / "batching.py"
+)
+batching = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batching)
+MicroBatcher = batching.MicroBatcher
+
+
+class RecordingInfer:
+    """
+    Stub inference: upper-cases each string and records every batch.
+    Any image equal to "bad" makes the whole batch fail.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, images):
+        with self.lock:
+            self.batches.append(list(images))
+        if "bad" in images:
+            raise RuntimeError("inference failed")
+        return [image.upper() for image in images]
+
+
+def test_submit_returns_own_result():
+    batcher = MicroBatcher(RecordingInfer(), window_ms=5)
+    assert batcher.submit("abc") == "ABC"
+
+
+def test_submit_many_preserves_order():
+    infer = RecordingInfer()
+    batcher = MicroBatcher(infer, max_batch=3, window_ms=5)
+
+    images = [f"img{i}" for i in range(7)]
+    assert batcher.submit_many(images) == [image.upper() for image in images]
+    assert all(len(batch) <= 3 for batch in infer.batches)
+
+
+def test_batches_only_contain_one_bucket():
+    infer = RecordingInfer()
+    batcher = MicroBatcher(infer, max_batch=8, window_ms=20, key=lambda image: image[0])
+
+    results = batcher.submit_many(["a1", "b1", "a2", "b2", "a3"])
+
+    assert results == ["A1", "B1", "A2", "B2", "A3"]
+    assert sorted(map(sorted, infer.batches)) == [["a1", "a2", "a3"], ["b1", "b2"]]
+    assert batcher.bucket_stats() == {
+        "a": {"images": 3, "batches": 1},
+        "b": {"images": 2, "batches": 1},
+    }
+
+
+def test_full_bucket_dispatches_before_deadline():
+    infer = RecordingInfer()
+    # A window this long would time out the test if dispatch waited for it
+    batcher = MicroBatcher(infer, max_batch=2, window_ms=60_000)
+
+    assert batcher.submit_many(["x", "y"]) == ["X", "Y"]
+    assert infer.batches == [["x", "y"]]
+
+
+def test_error_is_raised_in_every_caller_of_the_batch():
+    batcher = MicroBatcher(RecordingInfer(), max_batch=2, window_ms=50)
+    errors = []
+
+    def call(image):
+        try:
+            batcher.submit(image)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call, args=(image,)) for image in ("ok", "bad")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 2
+
+    # The workers survive a failed batch
+    assert batcher.submit("ok") == "OK"
+
+
+def test_failing_key_does_not_stop_the_collector():
+    def key(image):
+        if image == "unkeyable":
+            raise ValueError("no key")
+        return None
+
+    batcher = MicroBatcher(RecordingInfer(), window_ms=5, key=key)
+
+    with pytest.raises(ValueError):
+        batcher.submit("unkeyable")
+    assert batcher.submit("ok") == "OK"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_threads_restart_after_fork():
+    batcher = MicroBatcher(RecordingInfer(), window_ms=5)
+    assert batcher.submit("parent") == "PARENT"
+
+    pid = os.fork()
+    if pid == 0:
+        # Exit code tells the parent whether the child got its result
+        os._exit(0 if batcher.submit("child") == "CHILD" else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
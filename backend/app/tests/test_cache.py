@@ -0,0 +1,68 @@
+"""
+Tests for the OCR result cache
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Checks content keys, LRU eviction, the disabled cache and empty results.
+Run from the backend/app folder with: python -m pytest tests
+"""
+
+import importlib.util
+import pathlib
+
+# Load cache.py directly: importing the ocr_utils package would load the
+# EasyOCR model
+_spec = importlib.util.spec_from_file_location(
+    "cache", pathlib.Path(__file__).parents[1] / "ocr_utils" / "cache.py"
+)
+cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache)
+ResultCache = cache.ResultCache
+
+
+def test_content_key_depends_only_on_content():
+    assert cache.content_key(b"image") == cache.content_key(b"image")
+    assert cache.content_key(b"image") != cache.content_key(b"other")
+    assert len(cache.content_key(b"image")) == 32
+
+
+def test_get_missing_returns_none():
+    assert ResultCache(4).get("missing") is None
+
+
+def test_evicts_least_recently_used():
+    results = ResultCache(2)
+    results.put("a", "A")
+    results.put("b", "B")
+
+    # Reading "a" makes "b" the least recently used entry
+    assert results.get("a") == "A"
+    results.put("c", "C")
+
+    assert results.get("b") is None
+    assert results.get("a") == "A"
+    assert results.get("c") == "C"
+
+
+def test_put_existing_key_updates_value():
+    results = ResultCache(2)
+    results.put("a", "old")
+    results.put("a", "new")
+    assert results.get("a") == "new"
+
+
+def test_maxsize_zero_disables_cache():
+    results = ResultCache(0)
+    results.put("a", "A")
+    assert results.get("a") is None
+
+
+def test_empty_text_is_a_hit():
+    # An image without text is cached as "", which must not look like a miss
+    results = ResultCache(2)
+    results.put("blank", "")
+    assert results.get("blank") == ""
+    assert results.get("blank") is not None
@@ -0,0 +1,45 @@
+"""
+Tests for text post-processing
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Checks clean_text on already-clean text (fast path), whitespace and
+non-printable characters.
+Run from the backend/app folder with: python -m pytest tests
+"""
+
+import importlib.util
+import pathlib
+
+import pytest
+
+# Load postprocess.py directly: importing the ocr_utils package would load
+# the EasyOCR model
+_spec = importlib.util.spec_from_file_location(
+    "postprocess", pathlib.Path(__file__).parents[1] / "ocr_utils" / "postprocess.py"
+)
+postprocess = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(postprocess)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Fast path: printable ASCII with single spaces, only stripped
+    ("Hello world", "Hello world"),
+    ("  Hello world  ", "Hello world"),
+    ("", ""),
+    # Newlines, tabs and runs of spaces become a single space
+    ("Hello\nworld", "Hello world"),
+    ("Hello\t\tworld", "Hello world"),
+    ("Hello    world", "Hello world"),
+    (" \n Hello \r\n world \t", "Hello world"),
+    # Non-printable / non-ASCII characters are replaced by a space, even
+    # inside a word
+    ("naïve", "na ve"),
+    ("a\x00b", "a b"),
+    ("café\n", "caf"),
+])
+def test_clean_text(text, expected):
+    assert postprocess.clean_text(text) == expected
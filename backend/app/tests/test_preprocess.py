@@ -0,0 +1,41 @@
+"""
+Tests for image preprocessing helpers
+
+Author: Aritra Chakraborty
+Author: Shuvomoy Sarkar
+Date: 26-Oct-2025
+Description:
+-------------
+Checks downscale_image on ordinary and extreme image shapes.
+Run from the backend/app folder with: python -m pytest tests
+"""
+
+import importlib.util
+import pathlib
+
+import numpy as np
+import pytest
+
+# Load preprocess.py directly: importing the ocr_utils package would load
+# the EasyOCR model
+_spec = importlib.util.spec_from_file_location(
+    "preprocess", pathlib.Path(__file__).parents[1] / "ocr_utils" / "preprocess.py"
+)
+preprocess = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(preprocess)
+
+
+@pytest.mark.parametrize("shape, expected", [
+    ((4000, 3000, 3), (1600, 1200, 3)),
+    ((100, 200, 3), (100, 200, 3)),
+    ((1, 5000, 3), (1, 1600, 3)),
+    ((5000, 1), (1600, 1)),
+])
+def test_downscale_image(shape, expected):
+    img = np.zeros(shape, np.uint8)
+    assert preprocess.downscale_image(img, max_side=1600).shape == expected
+
+
+def test_downscale_disabled():
+    img = np.zeros((4000, 3000), np.uint8)
+    assert preprocess.downscale_image(img, max_side=0) is img